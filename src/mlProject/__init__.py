@@ -1,6 +1,8 @@
 import os      # Provides functions for interacting with the operating system
 import sys     # Provides access to system-specific parameters and functions
+import atexit  # Registers a final flush of the buffered log file at interpreter exit
 import logging # Standard library module for logging events and messages
+from logging.handlers import MemoryHandler  # Buffers records before handing them to the file handler
 
 # Define a logging format that includes the time, log level, module, and message
 logging_str = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
@@ -11,21 +13,45 @@ log_dir = "logs"
 # Construct the full path to the log file by joining the directory and the log filename
 log_filepath = os.path.join(log_dir, "running_logs.log")
 
-# Ensure the log directory exists; create it if it doesn't
-os.makedirs(log_dir, exist_ok=True)
-
-# Configure the logging system with:
-# - INFO level (i.e., all messages with level INFO and above will be logged)
-# - The defined logging format (logging_str)
-# - Two handlers: one for writing logs to a file and another for outputting logs to the console
-logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
-    handlers=[
-        logging.FileHandler(log_filepath),  # Logs messages to the file specified by log_filepath
-        logging.StreamHandler(sys.stdout)   # Also logs messages to the standard output (console)
-    ]
-)
+# Tracks whether configure_logging() has already run in this process
+_CONFIGURED = False
+
+
+def configure_logging():
+    """
+    Sets up the project's file and console logging. Called explicitly by entry
+    points (main.py, the stage scripts) rather than at import time, so importing
+    the package doesn't create the log directory or any handlers. Safe to call
+    more than once.
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+
+    # Ensure the log directory exists; create it if it doesn't
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Buffer file writes: records are flushed to the file every 1024 records, on any
+    # ERROR or above, and at exit, instead of one write per record
+    file_handler = logging.FileHandler(log_filepath)
+    file_handler.setFormatter(logging.Formatter(logging_str))  # basicConfig only formats the MemoryHandler
+    memory_handler = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    atexit.register(memory_handler.flush)
+
+    # Configure the logging system with:
+    # - INFO level (i.e., all messages with level INFO and above will be logged)
+    # - The defined logging format (logging_str)
+    # - Two handlers: one for writing logs to a file and another for outputting logs to the console
+    logging.basicConfig(
+        level=logging.INFO,
+        format=logging_str,
+        handlers=[
+            memory_handler,                     # Logs messages (buffered) to the file specified by log_filepath
+            logging.StreamHandler(sys.stdout)   # Also logs messages to the standard output (console)
+        ]
+    )
+    _CONFIGURED = True
+
 
 # Create a named logger "mlProjectLogger" that can be used across the project for logging
 logger = logging.getLogger("mlProjectLogger")
@@ -1,8 +1,8 @@
 import os
 from mlProject import logger
-from sklearn.model_selection import train_test_split
-import pandas as pd
 from mlProject.entity.config_entity import DataTransformationConfig
+from mlProject.utils.common import get_parquet_copy
+from pathlib import Path
 
 
 class DataTransformation:
@@ -17,7 +17,16 @@ class DataTransformation:
 
 
     def train_test_spliting(self):
-        data = pd.read_csv(self.config.data_path)
+        # Imported here so importing the pipeline modules doesn't pay for pandas/sklearn
+        import pandas as pd
+        from sklearn.model_selection import train_test_split
+
+        # Prefer the typed Parquet copy written by data validation over re-parsing the CSV
+        parquet_path = get_parquet_copy(Path(self.config.data_path), self.config.all_schema)
+        if parquet_path is not None:
+            data = pd.read_parquet(parquet_path)
+        else:
+            data = pd.read_csv(self.config.data_path)
 
         # Split the data into training and test sets. (0.75, 0.25) split.
         train, test = train_test_split(data)
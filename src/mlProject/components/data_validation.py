@@ -1,9 +1,77 @@
 import os
+import re
+import csv
+import json
+import mmap
+import hashlib
+import tempfile
+from pathlib import Path
 from mlProject import logger
 from mlProject.entity.config_entity import DataValidationConfig
-import pandas as pd
+from mlProject.utils.common import load_json, get_parquet_copy, get_schema_hash, PARQUET_SCHEMA_KEY
 
 
+# Minimum block size used when only a sample of the CSV is type-checked; roughly
+# the first thousand rows of a typical numeric CSV. Wide files get larger blocks
+# (see `_block_size`), since a block must hold the header and whole rows.
+SAMPLE_BLOCK_SIZE = 1 << 16
+
+
+def _to_arrow(dtype):
+    """
+    Maps a pandas/NumPy dtype string from the schema (e.g. "float64") to the
+    equivalent Arrow type.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    if dtype == "object":
+        return pa.string()
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+def _block_size(minimum, header_size):
+    """
+    Returns a CSV block size of at least `minimum` bytes that also fits the
+    header and a few dozen rows of similar width; Arrow fails on a header or
+    row longer than one block.
+    """
+    return max(minimum, 64 * header_size)
+
+
+def _null_integer_columns(data):
+    """
+    Returns the integer-typed columns of an Arrow table or record batch that
+    contain nulls. Arrow reads a blank cell as null even in an int64 column,
+    where pandas would have fallen back to float64, so these don't really
+    have the expected integer type.
+    """
+    import pyarrow as pa
+
+    return [field.name for i, field in enumerate(data.schema)
+            if pa.types.is_integer(field.type) and data.column(i).null_count]
+
+
+def _write_atomic(path, text):
+    """
+    Writes text to a file in a single write, through a temp file in the same
+    directory moved into place with os.replace, so a crashed run can't leave
+    the file truncated. The file gets the usual umask-derived permissions.
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        # mkstemp creates the file as 0600; give it the mode open() would have used
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
 
 class DataValidation:
     def __init__(self, config):
@@ -15,8 +83,127 @@ class DataValidation:
                 - unzip_data_dir: Path to the CSV data file.
                 - all_schema: Dictionary of expected column names and their data types.
                 - STATUS_FILE: Path to the file where validation status will be written.
+                - full_scan: If True, type-check every row instead of a sample.
         """
         self.config = config
+        self._schema = None  # pandera schema, built on first use by `_pandera_schema`
+
+    def _pandera_schema(self):
+        """
+        Column presence and dtype checks, compiled once from the expected schema.
+        Extra columns are allowed, as before. Built on first use so that pandera
+        (and pandas) are only imported when validation actually runs.
+        """
+        if self._schema is None:
+            # pandera.pandas, not the top-level module, which warns on every import
+            from pandera.pandas import Column, DataFrameSchema
+            self._schema = DataFrameSchema(
+                {col: Column(dtype) for col, dtype in self.config.all_schema.items()})
+        return self._schema
+
+    @staticmethod
+    def _offending_column(error_text, header):
+        """
+        Extracts the name of the column that failed dtype conversion from a
+        CSV conversion error such as "In CSV column #11: ...".
+        """
+        match = re.search(r"column #(\d+)", error_text)
+        if match and int(match.group(1)) < len(header):
+            return header[int(match.group(1))]
+        return "unknown column"
+
+    def _fingerprint_path(self) -> Path:
+        """
+        Path of the JSON sidecar, next to STATUS_FILE, recording the fingerprint
+        of the last successfully validated data file.
+        """
+        return Path(self.config.STATUS_FILE).with_suffix(".json")
+
+    def _schema_hash(self) -> str:
+        """
+        Hashes the expected schema together with `full_scan`, so a cached result
+        is only reused for the same checks.
+        """
+        key = json.dumps([dict(self.config.all_schema), self.config.full_scan], sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _data_digest(self) -> str:
+        """
+        SHA-256 of the data file, read through a memory map.
+        """
+        digest = hashlib.sha256()
+        with open(self.config.unzip_data_dir, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:  # mmap can't map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest.update(mm)
+        return digest.hexdigest()
+
+    def _is_unchanged(self, size, digest) -> bool:
+        """
+        Returns True if the data file (given by its size and digest) and schema
+        match the fingerprint of the last successful validation, so the CSV
+        doesn't need to be parsed again. A missing, truncated or malformed
+        fingerprint just means a full check.
+        """
+        fingerprint_path = self._fingerprint_path()
+        if not (fingerprint_path.exists() and os.path.exists(self.config.STATUS_FILE)):
+            return False
+        try:
+            cached = load_json(fingerprint_path)
+            status, schema_hash = cached.status, cached.schema_hash
+            cached_size, cached_digest = cached.size, cached.digest
+        except (ValueError, KeyError, AttributeError, TypeError):
+            logger.warning("Ignoring unreadable validation fingerprint: %s", fingerprint_path)
+            return False
+        return (status is True
+                and schema_hash == self._schema_hash()
+                and size == cached_size
+                and digest == cached_digest)
+
+    def _read_schema(self, expected_types, header_size):
+        """
+        Parses the CSV with the expected column types and returns the resulting
+        Arrow schema, along with the converted data: the whole table, or with a
+        sample just the first record batch (None if the file has no rows).
+        Unless `full_scan` is set in the config, only the first block of rows of
+        the expected columns is converted, which is enough to check the column
+        types without reading the whole file. `header_size` is the approximate
+        length of the header row in bytes, used to size the parser's blocks.
+        """
+        from pyarrow import csv as pacsv
+
+        if self.config.full_scan:
+            read_opts = pacsv.ReadOptions(use_threads=True,
+                                          block_size=_block_size(8 << 20, header_size))
+            convert_opts = pacsv.ConvertOptions(column_types=expected_types)
+            table = pacsv.read_csv(self.config.unzip_data_dir,
+                                   read_options=read_opts,
+                                   convert_options=convert_opts)
+            logger.info("Data loaded from: %s", self.config.unzip_data_dir)
+            return table.schema, table
+
+        read_opts = pacsv.ReadOptions(block_size=_block_size(SAMPLE_BLOCK_SIZE, header_size))
+        convert_opts = pacsv.ConvertOptions(column_types=expected_types,
+                                            include_columns=list(expected_types))
+        reader = pacsv.open_csv(self.config.unzip_data_dir,
+                                read_options=read_opts,
+                                convert_options=convert_opts)
+        batch = next(iter(reader), None)  # Convert the first block to surface type errors
+        logger.info("Data sampled from: %s", self.config.unzip_data_dir)
+        return reader.schema, batch
+
+    def _write_parquet(self, table):
+        """
+        Saves the fully parsed and validated CSV as Parquet next to it, with the
+        confirmed column types, so later runs and stages can skip CSV parsing.
+        """
+        from pyarrow import parquet as pq
+
+        parquet_path = Path(self.config.unzip_data_dir).with_suffix('.parquet')
+        metadata = dict(table.schema.metadata or {})
+        metadata[PARQUET_SCHEMA_KEY] = get_schema_hash(self.config.all_schema)
+        pq.write_table(table.replace_schema_metadata(metadata), parquet_path, compression='zstd')
+        logger.info("Validated data saved as Parquet at: %s", parquet_path)
 
     def validate_all_columns(self) -> bool:
         """
@@ -25,46 +212,133 @@ class DataValidation:
           2. The data types of each column match what is expected.
           
         Writes the validation status (and any error messages) to the status file.
+        If the data file and schema are unchanged since the last successful
+        validation, the checks are skipped and True is returned.
         
         Returns:
             bool: True if all validations pass; False otherwise.
         """
-        try:
-            # Load the CSV data into a DataFrame.
-            data = pd.read_csv(self.config.unzip_data_dir)           
+        # Imported here so importing the pipeline modules doesn't pay for pyarrow
+        import pyarrow as pa
+        from pyarrow import parquet as pq
 
-            logger.info(f"Data loaded from: {self.config.unzip_data_dir}")
+        try:
+            # Hash the file once, before parsing, so a recorded fingerprint describes
+            # exactly the bytes that were validated
+            size = os.stat(self.config.unzip_data_dir).st_size
+            digest = self._data_digest()
+            if self._is_unchanged(size, digest):
+                logger.info("Data unchanged since last successful validation: %s", self.config.unzip_data_dir)
+                return True
 
             valid = True  # Flag indicating overall validation status
             messages = []  # List to collect error messages
 
-            # 1. Check that all expected columns are present.
-            expected_columns = list(self.config.all_schema.keys())
-            missing_columns = [col for col in expected_columns if col not in data.columns]
+            # A Parquet copy written by a previous successful run carries the schema
+            # in its footer, so it can be validated without reading any data. It is
+            # only used if it was written for the current schema.
+            parquet_path = get_parquet_copy(Path(self.config.unzip_data_dir), self.config.all_schema)
+            if parquet_path is not None:
+                parquet_schema = pq.read_schema(parquet_path)
+                header = parquet_schema.names
+                logger.info("Schema read from Parquet copy: %s", parquet_path)
+            else:
+                # utf-8-sig strips a BOM, matching how Arrow (and pandas) read the header
+                with open(self.config.unzip_data_dir, newline='', encoding='utf-8-sig') as f:
+                    header = next(csv.reader(f), [])
+            cols = set(header)
+
+            # Parse the present columns (a sample, or every row with full_scan) typed
+            # up front from the schema; a failed conversion is a dtype mismatch.
+            expected_types = {col: _to_arrow(dtype) for col, dtype in self.config.all_schema.items()
+                              if col in cols}
+            table = None
+            conversion_errors, parse_errors = [], []
+            try:
+                if parquet_path is not None:
+                    schema = parquet_schema
+                else:
+                    header_size = len(",".join(header).encode())
+                    schema, data = self._read_schema(expected_types, header_size)
+                    if data is not None:
+                        # Blank cells in integer columns convert to null rather than failing
+                        conversion_errors = [f"{col}: expected {expected_types[col]}, got null values"
+                                             for col in _null_integer_columns(data)]
+                    if self.config.full_scan:
+                        table = data
+            except pa.ArrowInvalid as e:
+                if "conversion error" in str(e):
+                    conversion_errors = [f"{self._offending_column(str(e), header)}: {e}"]
+                else:
+                    # Malformed CSV (e.g. a row with the wrong number of fields), not a type problem
+                    parse_errors = [str(e)]
+                # Still check column presence against the header
+                schema = pa.schema(list(expected_types.items()))
+
+            # Check column presence and dtypes against the pandera schema. Both only
+            # depend on the Arrow schema, so an empty frame with the same columns and
+            # types is validated rather than the data itself.
+            from pandera.errors import SchemaErrors  # Imported lazily, after the fingerprint shortcut above
+            missing_columns, dtype_errors = [], []
+            try:
+                self._pandera_schema().validate(schema.empty_table().to_pandas(), lazy=True)
+            except SchemaErrors as e:
+                for failure in e.failure_cases.itertuples():
+                    if failure.check == "column_in_dataframe":
+                        missing_columns.append(failure.failure_case)
+                    # The CSV is parsed with column_types forced to the expected types, and
+                    # a Parquet copy is only used for the schema it was written with, so the
+                    # real dtype check is the conversion/null check above. This branch is
+                    # only a safety net.
+                    elif failure.check.startswith("dtype("):
+                        dtype_errors.append(f"{failure.column}: expected {failure.check}, got {failure.failure_case}")
+            dtype_errors += conversion_errors
+
             if missing_columns:
                 error_msg = f"Missing columns: {missing_columns}"
                 logger.error(error_msg)
                 messages.append(error_msg)
                 valid = False
 
-            # 2. Validate that the data types of each column match the expected types.
-            dtype_errors = []
-            for col, expected_type in self.config.all_schema.items():
-                if col in data.columns:
-                    # Compare the string representation of the pandas dtype with the expected type.
-                    if str(data[col].dtype) != expected_type:
-                        dtype_errors.append(f"{col}: expected {expected_type}, got {data[col].dtype}")
             if dtype_errors:
                 error_msg = f"Data type mismatches found: {dtype_errors}"
                 logger.error(error_msg)
                 messages.append(error_msg)
                 valid = False
 
-            # Write the validation status and any messages to the status file.
-            with open(self.config.STATUS_FILE, 'w') as f:
-                f.write(f"Validation status: {valid}\n")
-                if messages:
-                    f.write("\n".join(messages))
+            if parse_errors:
+                error_msg = f"CSV could not be parsed: {parse_errors}"
+                logger.error(error_msg)
+                messages.append(error_msg)
+                valid = False
+
+            # Only a full scan has converted every row, so only then is a Parquet copy
+            # written; it is saved before the result is recorded below. After any other
+            # check of the CSV, an existing copy no longer matches what was validated,
+            # so it is removed rather than left for later stages to read.
+            if parquet_path is None:
+                if valid and table is not None:
+                    self._write_parquet(table)
+                else:
+                    Path(self.config.unzip_data_dir).with_suffix('.parquet').unlink(missing_ok=True)
+
+            # Write the validation status and any messages to the status file in a
+            # single write, atomically, so a crashed run can't leave it truncated.
+            _write_atomic(self.config.STATUS_FILE,
+                          f"Validation status: {valid}\n" + "\n".join(messages))
+
+            # Record the fingerprint of a passing file so it can skip validation next
+            # time. After a failure, drop any earlier fingerprint so it can't
+            # short-circuit to True while STATUS_FILE says False.
+            if valid:
+                _write_atomic(self._fingerprint_path(), json.dumps({
+                    "digest": digest,
+                    "size": size,
+                    "schema_hash": self._schema_hash(),
+                    "status": valid,
+                }, indent=4))
+            else:
+                self._fingerprint_path().unlink(missing_ok=True)
 
             if valid:
                 logger.info("All validations passed successfully.")
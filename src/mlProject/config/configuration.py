@@ -46,6 +46,7 @@ class ConfigurationManager:
             STATUS_FILE=config.STATUS_FILE,
             unzip_data_dir=config.unzip_data_dir,
             all_schema=schema,
+            full_scan=config.full_scan,
             # target_column=target_column
         )
 
@@ -60,6 +61,7 @@ class ConfigurationManager:
         data_transformation_config = DataTransformationConfig(
             root_dir=config.root_dir,
             data_path=config.data_path,
+            all_schema=self.schema.COLUMNS,
         )
 
         return data_transformation_config
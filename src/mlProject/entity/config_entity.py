@@ -15,8 +15,10 @@ class DataValidationConfig:
     STATUS_FILE: str
     unzip_data_dir: Path
     all_schema: dict
+    full_scan: bool
     
 @dataclass(frozen=True)
 class DataTransformationConfig:
     root_dir: Path
-    data_path: Path
\ No newline at end of file
+    data_path: Path
+    all_schema: dict
\ No newline at end of file
@@ -1,6 +1,6 @@
 from mlProject.config.configuration import ConfigurationManager
 from mlProject.components.data_ingestion import DataIngestion
-from mlProject import logger
+from mlProject import logger, configure_logging
 
 
 
@@ -20,6 +20,7 @@ class DataIngestionTrainingPipeline:
 
     
 if __name__ == '__main__':
+    configure_logging()
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataIngestionTrainingPipeline()
@@ -1,6 +1,6 @@
 from mlProject.config.configuration import ConfigurationManager
 from mlProject.components.data_validation import DataValidation
-from mlProject import logger
+from mlProject import logger, configure_logging
 
 
 STAGE_NAME = "Data Validation stage"
@@ -18,6 +18,7 @@ class DataValidationTrainingPipeline:
 
 
 if __name__ == '__main__':
+    configure_logging()
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataValidationTrainingPipeline()
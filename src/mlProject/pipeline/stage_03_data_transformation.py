@@ -1,6 +1,6 @@
 from mlProject.config.configuration import ConfigurationManager
 from mlProject.components.data_transformation import DataTransformation
-from mlProject import logger
+from mlProject import logger, configure_logging
 from pathlib import Path
 
 
@@ -35,6 +35,7 @@ class DataTransformationTrainingPipeline:
 
 
 if __name__ == '__main__':
+    configure_logging()
     try:
         logger.info(f">>>>>> stage {STAGE_NAME} started <<<<<<")
         obj = DataTransformationTrainingPipeline()
@@ -1,16 +1,69 @@
 import os                           # Provides functions for interacting with the operating system
+import logging                      # Used to check the logger's effective level before formatting
 from box.exceptions import BoxValueError  # Exception from the Box library used when a Box value is invalid or missing
 import yaml                         # Library for parsing YAML files
+try:
+    from yaml import CSafeLoader    # libyaml-backed C loader, much faster than the pure-Python one
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader  # PyYAML built without libyaml
 from src.mlProject import logger        # Importing the project's custom logger for logging messages
 import json                         # Library for JSON serialization and deserialization
-import joblib                       # Library for saving and loading Python objects in binary format
+try:
+    import orjson                   # Faster C/SIMD JSON library, used when installed
+except ImportError:
+    orjson = None
+import pickle                       # Protocol 5 pickling with out-of-band buffers
+import struct                       # Packs the length headers of the out-of-band buffers
+import tempfile                     # Temp files for replacing binaries atomically
 from ensure import ensure_annotations  # Decorator to enforce type annotations at runtime
 from box import ConfigBox           # ConfigBox wraps dictionaries to allow attribute-style access
 from pathlib import Path            # Provides object-oriented filesystem paths
-from typing import Any              # Allows for type annotations of any type
+from typing import Any, Optional    # Allows for type annotations of any type
+from functools import lru_cache     # Memoizes parsed files between calls
+import copy                         # Deep copies cached content so callers can't mutate the cache
+import hashlib                      # Hashes schemas to tie Parquet copies to the schema they were validated with
 
 
-@ensure_annotations
+def _maybe_ensure(func):
+    """
+    Applies `ensure_annotations` runtime type checks during development. They are
+    skipped when ML_FAST is set in the environment or Python runs with -O, so
+    deployed pipelines don't pay the per-call introspection cost.
+    """
+    if os.environ.get("ML_FAST") or not __debug__:
+        return func
+    return ensure_annotations(func)
+
+
+@lru_cache(maxsize=64)
+def _read_yaml_cached(path_str: str, mtime_ns: int, size: int):
+    """
+    Parses a YAML file. Cached on (path, mtime, size) so an unchanged file is
+    only parsed once per process, while an edited file is picked up again.
+    """
+    with open(path_str) as yaml_file:
+        # Safely load the YAML file content into a Python dictionary
+        return yaml.load(yaml_file, Loader=CSafeLoader)
+
+
+@lru_cache(maxsize=64)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int):
+    """
+    Parses a JSON file. Cached on (path, mtime, size) like `_read_yaml_cached`.
+    """
+    with open(path_str, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals that json.dump writes; let json parse those
+            pass
+    # Load the JSON content from the file into a dictionary
+    return json.loads(raw)
+
+
+@_maybe_ensure
 def read_yaml(path_to_yaml: Path) -> ConfigBox:
     """
     Reads a YAML file and returns its contents as a ConfigBox object.
@@ -26,12 +79,12 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         ConfigBox: The contents of the YAML file as a ConfigBox.
     """
     try:
-        with open(path_to_yaml) as yaml_file:
-            # Safely load the YAML file content into a Python dictionary
-            content = yaml.safe_load(yaml_file)
-            logger.info(f"yaml file: {path_to_yaml} loaded successfully")
-            # Wrap the dictionary in a ConfigBox for attribute-style access and return it
-            return ConfigBox(content)
+        st = os.stat(path_to_yaml)
+        # Copy the cached content so mutations by the caller don't leak into the cache
+        content = copy.deepcopy(_read_yaml_cached(str(path_to_yaml), st.st_mtime_ns, st.st_size))
+        logger.info("yaml file: %s loaded successfully", path_to_yaml)
+        # Wrap the dictionary in a ConfigBox for attribute-style access and return it
+        return ConfigBox(content)
     except BoxValueError:
         # Raise an error if the YAML file is empty or invalid
         raise ValueError("yaml file is empty")
@@ -40,40 +93,63 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         raise e
 
 
-@ensure_annotations
+@_maybe_ensure
 def create_directories(path_to_directories: list, verbose=True):
     """
     Creates a list of directories if they do not exist.
 
     Args:
         path_to_directories (list): A list of directory paths to be created.
-        verbose (bool, optional): If True, logs each directory creation. Defaults to True.
+        verbose (bool, optional): If True, logs the directories created. Defaults to True.
     """
-    for path in path_to_directories:
+    # Deepest paths first, so that ancestors are created as a side effect of their children
+    paths = sorted({os.path.normpath(path) for path in path_to_directories}, key=len, reverse=True)
+    covered = set()
+    leaves = []
+    for path in paths:
+        if path in covered:
+            continue
         # Create the directory and any necessary parent directories
         os.makedirs(path, exist_ok=True)
-        if verbose:
-            # Log the creation of each directory
-            logger.info(f"created directory at: {path}")
+        leaves.append(path)
+        # Mark the path and all of its ancestors as done
+        parent = path
+        while parent and parent not in covered:
+            covered.add(parent)
+            parent = os.path.dirname(parent)
 
+    if verbose and logger.isEnabledFor(logging.INFO):
+        # Log all created directories in a single line
+        logger.info("created %d directories under: %s", len(paths), leaves)
 
-@ensure_annotations
+
+@_maybe_ensure
 def save_json(path: Path, data: dict):
     """
     Saves a dictionary as a JSON file at the specified path.
 
+    When orjson is installed it is used for writing; it accepts NumPy scalars,
+    but writes NaN and infinite floats as null. Without orjson, the stdlib json
+    module writes them as NaN/Infinity and rejects NumPy integers.
+
     Args:
         path (Path): The file path where the JSON data will be saved.
         data (dict): The data to be saved in JSON format.
     """
-    with open(path, "w") as f:
-        # Dump the dictionary to the file with an indentation of 4 for readability
-        json.dump(data, f, indent=4)
+    if orjson is not None:
+        # Accept NumPy scalars (e.g. metrics) and non-string keys; NaN/inf are written as null
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(path, "w") as f:
+            # Dump the dictionary to the file with an indentation of 4 for readability
+            json.dump(data, f, indent=4)
 
-    logger.info(f"json file saved at: {path}")
+    logger.info("json file saved at: %s", path)
 
 
-@ensure_annotations
+@_maybe_ensure
 def load_json(path: Path) -> ConfigBox:
     """
     Loads JSON data from a file and returns it as a ConfigBox.
@@ -84,47 +160,165 @@ def load_json(path: Path) -> ConfigBox:
     Returns:
         ConfigBox: The loaded data wrapped in a ConfigBox for attribute-style access.
     """
-    with open(path) as f:
-        # Load the JSON content from the file into a dictionary
-        content = json.load(f)
+    st = os.stat(path)
+    # Copy the cached content so mutations by the caller don't leak into the cache
+    content = copy.deepcopy(_load_json_cached(str(path), st.st_mtime_ns, st.st_size))
 
-    logger.info(f"json file loaded successfully from: {path}")
+    logger.info("json file loaded successfully from: %s", path)
     # Wrap the dictionary in a ConfigBox and return it
     return ConfigBox(content)
 
 
-@ensure_annotations
+def _temp_file_beside(path):
+    """
+    Creates a temp file in the same directory as `path`, with the permissions
+    open() would have given it, and returns its (fd, path).
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path))
+    # mkstemp creates the file as 0600
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_path, 0o666 & ~umask)
+    return fd, tmp_path
+
+
+def _buffer_path(path) -> str:
+    """
+    Returns the path of the sidecar file holding the out-of-band pickle buffers.
+    """
+    return f"{path}.buf"
+
+
+@_maybe_ensure
 def save_bin(data: Any, path: Path):
     """
-    Saves any Python object as a binary file using joblib.
+    Saves any Python object as a binary file.
+
+    The object is pickled with protocol 5, and large buffers (e.g. NumPy arrays)
+    are written zero-copy to a `<path>.buf` sidecar file, which is only created
+    when there are such buffers. Both files are written to temp files first and
+    moved into place with os.replace.
+
+    Paths ending in `.zst` are instead written as a single pickle stream
+    compressed with multithreaded Zstandard.
 
     Args:
         data (Any): The Python object to be saved.
         path (Path): The file path where the binary data will be saved.
     """
-    # Dump the object to the specified file path
-    joblib.dump(value=data, filename=path)
-    logger.info(f"binary file saved at: {path}")
+    if Path(path).suffix == ".zst":
+        import zstandard as zstd  # Imported lazily; only needed for .zst binaries
+        cctx = zstd.ZstdCompressor(level=3, threads=-1)
+        with open(path, "wb") as f, cctx.stream_writer(f) as writer:
+            pickle.dump(data, writer, protocol=5)
+        logger.info("binary file saved at: %s", path)
+        return
+
+    if os.path.exists(path) and not os.access(path, os.W_OK):
+        raise PermissionError(f"binary file is not writable: {path}")
+
+    buffer_path = _buffer_path(path)
+    buffers = []
+    tmp_buffer_path = None
+    fd, tmp_path = _temp_file_beside(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=5, buffer_callback=buffers.append)
+        if buffers:
+            fd, tmp_buffer_path = _temp_file_beside(buffer_path)
+            # Each buffer is stored as an 8-byte length header followed by its raw bytes
+            with os.fdopen(fd, "wb") as f:
+                for buffer in buffers:
+                    raw = buffer.raw()
+                    f.write(struct.pack("<Q", raw.nbytes))
+                    f.write(raw)
 
+        # Retire the previous save before moving the new files in, so a crash in
+        # between leaves no pickle rather than one paired with the wrong sidecar
+        if os.path.exists(path):
+            os.remove(path)
+        if tmp_buffer_path is not None:
+            os.replace(tmp_buffer_path, buffer_path)
+        elif os.path.exists(buffer_path):
+            os.remove(buffer_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Only clean up the temp files this call created
+        for created in (tmp_path, tmp_buffer_path):
+            if created is not None and os.path.exists(created):
+                os.remove(created)
+        raise
+    logger.info("binary file saved at: %s", path)
 
-@ensure_annotations
+
+@_maybe_ensure
 def load_bin(path: Path) -> Any:
     """
-    Loads a Python object from a binary file.
+    Loads a Python object saved by `save_bin`. Files without a buffer sidecar,
+    including older joblib dumps, are loaded with joblib. `.zst` files are
+    decompressed with Zstandard.
 
     Args:
         path (Path): The file path from where the binary data will be loaded.
 
+    Raises:
+        FileNotFoundError: If the file needs its `<path>.buf` sidecar and it is missing.
+
     Returns:
         Any: The Python object stored in the binary file.
     """
-    # Load the object using joblib from the specified file path
-    data = joblib.load(path)
-    logger.info(f"binary file loaded from: {path}")
+    buffer_path = _buffer_path(path)
+    if Path(path).suffix == ".zst":
+        import zstandard as zstd  # Imported lazily; only needed for .zst binaries
+        dctx = zstd.ZstdDecompressor()
+        with open(path, "rb") as f, dctx.stream_reader(f) as reader:
+            data = pickle.load(reader)
+    elif not os.path.exists(buffer_path):
+        import joblib  # Imported lazily so scripts that only read configs don't pay for it
+        try:
+            # Load the object using joblib from the specified file path
+            data = joblib.load(path)
+        except pickle.UnpicklingError as e:
+            if "out-of-band" not in str(e):
+                raise
+            raise FileNotFoundError(
+                f"{path} was saved with out-of-band buffers but its sidecar {buffer_path} is missing; "
+                "copy both files together") from e
+    else:
+        # Read the sidecar into a writable buffer and slice it without copying
+        blob = bytearray(os.path.getsize(buffer_path))
+        with open(buffer_path, "rb") as f:
+            f.readinto(blob)
+        view = memoryview(blob)
+        buffers = []
+        offset = 0
+        while offset < len(view):
+            (size,) = struct.unpack_from("<Q", view, offset)
+            offset += 8
+            buffers.append(view[offset:offset + size])
+            offset += size
+        with open(path, "rb") as f:
+            data = pickle.load(f, buffers=buffers)
+    logger.info("binary file loaded from: %s", path)
     return data
 
 
-@ensure_annotations
+@_maybe_ensure
+def get_size_bytes(path: Path) -> int:
+    """
+    Returns the size of a file in bytes.
+
+    Args:
+        path (Path): The file path whose size is to be determined.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    return os.stat(path).st_size
+
+
+@_maybe_ensure
 def get_size(path: Path) -> str:
     """
     Returns the size of a file in kilobytes.
@@ -135,6 +329,51 @@ def get_size(path: Path) -> str:
     Returns:
         str: A formatted string representing the size of the file in KB.
     """
-    # Calculate file size in kilobytes by dividing bytes by 1024 and rounding the result
-    size_in_kb = round(os.path.getsize(path) / 1024)
+    # Convert bytes to kilobytes with integer arithmetic, rounding to the nearest KB
+    size_in_kb = (get_size_bytes(path) + 512) >> 10
     return f"~ {size_in_kb} KB"
+
+
+# Parquet metadata key holding the hash of the schema a Parquet copy was validated with
+PARQUET_SCHEMA_KEY = b"mlproject.schema_hash"
+
+
+def get_schema_hash(schema: dict) -> bytes:
+    """
+    Hashes a schema of column names and dtypes, as stored under
+    PARQUET_SCHEMA_KEY in the metadata of a validated Parquet copy.
+
+    Args:
+        schema (dict): The expected column names and their data types.
+
+    Returns:
+        bytes: The hex digest of the schema, as bytes.
+    """
+    key = json.dumps(dict(schema), sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest().encode()
+
+
+def get_parquet_copy(path: Path, schema: dict) -> Optional[Path]:
+    """
+    Returns the Parquet copy of a CSV file, saved next to it by data validation,
+    if it exists, is at least as recent as the CSV, and was validated against
+    the given schema.
+
+    Args:
+        path (Path): The path of the CSV file.
+        schema (dict): The expected column names and their data types.
+
+    Returns:
+        Optional[Path]: The path of the Parquet copy, or None if there is no up-to-date copy.
+    """
+    parquet_path = Path(path).with_suffix(".parquet")
+    if not (parquet_path.exists() and os.stat(parquet_path).st_mtime_ns >= os.stat(path).st_mtime_ns):
+        return None
+
+    from pyarrow import parquet as pq  # Imported lazily; only needed when a copy exists
+
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    if metadata.get(PARQUET_SCHEMA_KEY) != get_schema_hash(schema):
+        logger.info("Ignoring Parquet copy written for a different schema: %s", parquet_path)
+        return None
+    return parquet_path